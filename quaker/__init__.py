@@ -8,7 +8,6 @@ setup_logging()
 
 __all__ = [
     "__version__",
-    "download",
     "Query",
     "Client",
 ]
@@ -1,5 +1,6 @@
 import argparse
 import logging
+from functools import lru_cache
 from typing import Optional, List
 
 from . import (
@@ -42,6 +43,7 @@ def run(cli_input: Optional[List[str]] = None) -> int:
     return exit_code
 
 
+@lru_cache(maxsize=None)
 def get_parser() -> argparse.ArgumentParser:
     cli_doc_head = "Access USGS Earthquake dataset."
     cli_doc = "\n\n".join([cli_doc_head, Query.doc_head])
@@ -1,19 +1,29 @@
+from hashlib import blake2b
 from io import StringIO
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime as dt, timedelta
 from pathlib import Path
-from os import PathLike, path, makedirs, remove
-from time import sleep
-from typing import Dict, List, Optional, Tuple
+from os import PathLike, makedirs, replace as replace_file
+from random import random
+from time import sleep, time
+from typing import Any, Dict, List, Optional, Tuple
 from requests import Response
-from requests.sessions import Request, Session
+from requests.sessions import Session
 from quaker.core.query import Query
 from quaker.core.record_filter import RecordFilter
 from quaker.globals import (
+    BACKOFF_BASE,
     BASE_URL,
+    CACHE_TTL,
     MAX_ATTEMPTS,
+    MAX_BACKOFF,
     RESPONSE_BAD_REQUEST,
     RESPONSE_NO_CONTENT,
     RESPONSE_NOT_FOUND,
+    RESPONSE_OK,
     UPPER_LIMIT,
     MAX_PAGES,
 )
@@ -25,15 +35,23 @@ import pandas as pd
 logger = logging.getLogger(__name__)
 
 class Client:
-    def __init__(self):
-        self.session = Session()
+    def __init__(self, cache_dir: Optional[PathLike] = None, session: Optional[Session] = None):
+        # Sessions passed in are owned (and closed) by the caller
+        self._owns_session = session is None
+        self.session = Session() if session is None else session
         self.history = []
+        self.cache_dir = None if cache_dir is None else Path(cache_dir).expanduser()
 
-    def execute(self, query: Query, output_file: Optional[PathLike] = None) -> Optional[pd.DataFrame]:
+    def execute(
+        self,
+        query: Query,
+        output_file: Optional[PathLike] = None,
+        n_workers: int = 1,
+    ) -> Optional[pd.DataFrame]:
         if output_file is None:
             query.format = "csv"
 
-        results = self._get_results(query)
+        results = self._get_results(query, n_workers)
         output, error_recived = self._write_results(results, output_file, query)
 
         if error_recived is not None:
@@ -41,10 +59,13 @@ class Client:
 
         return output
 
-    def _get_results(self, query):
+    def _get_results(self, query, n_workers=1):
         results = []
         try:
-            results = self._execute_paginiated(query)
+            if n_workers > 1:
+                results = self._execute_parallel(query, n_workers)
+            else:
+                results = self._execute_paginiated(query)
         except KeyboardInterrupt:
             logger.error("Keyboard interrupt recieved, safely closing session.")
         return results
@@ -75,7 +96,75 @@ class Client:
         return output, error_recived
 
     def _execute_paginiated(self, query: Query) -> List[str]:
-        results = []
+        header, records, footer = self._execute_pages(query)
+        return header + records + footer
+
+    def _execute_parallel(self, query: Query, n_workers: int) -> List[str]:
+        sub_queries = self._split_query(query, n_workers)
+        if sub_queries is None:
+            logger.warning("Query cannot be split into time intervals, executing sequentially")
+            return self._execute_paginiated(query)
+
+        # Sessions aren't shared across threads, so each interval gets its own client
+        clients = [Client(self.cache_dir) for _ in sub_queries]
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            intervals = list(
+                executor.map(
+                    Client._execute_pages,  # pylint: disable=protected-access
+                    clients,
+                    sub_queries,
+                )
+            )
+        for client in clients:
+            self.history += client.history
+
+        # Intervals without events (e.g. a 204 response) don't have a usable header or footer
+        populated = [interval for interval in intervals if len(interval[1]) > 0] or intervals[:1]
+
+        # Events on the boundary between intervals are returned twice
+        results = list(populated[0][0])
+        parser, record_filter = Parser(query), RecordFilter([])
+        for _, records, _ in populated:
+            if len(records) > 0:
+                event_ids, _, _ = parser.unpack_records(records)
+                results += record_filter(records, event_ids)
+        results += populated[-1][2]
+
+        return results
+
+    @staticmethod
+    def _split_query(query: Query, n_workers: int) -> Optional[List[Query]]:
+        if (
+            query.starttime is None
+            or query.endtime is None
+            or query.limit is not None
+            or query.offset is not None
+            or (query.orderby or "time") not in ["time", "time-asc"]
+        ):
+            return None
+
+        try:
+            starttime, endtime = dt.fromisoformat(query.starttime), dt.fromisoformat(query.endtime)
+            step = (endtime - starttime) / n_workers
+        except (TypeError, ValueError):
+            return None
+        if step <= timedelta(0):
+            return None
+
+        bounds = [starttime + i * step for i in range(n_workers)] + [endtime]
+        sub_queries = [
+            replace(query, starttime=t0.isoformat(), endtime=t1.isoformat())
+            for t0, t1 in zip(bounds[:-1], bounds[1:])
+        ]
+
+        # Results are ordered by descending time unless requested otherwise
+        if query.orderby != "time-asc":
+            sub_queries.reverse()
+
+        return sub_queries
+
+    def _execute_pages(self, query: Query) -> Tuple[List[str], List[str], List[str]]:
+        results_header, results = [], []
         parser, record_filter = Parser(query), RecordFilter([], maxlen=UPPER_LIMIT)
 
         header, records_raw, records, footer = [], [], [], []
@@ -101,7 +190,7 @@ class Client:
 
             if page_index == 0:
                 logger.info("header")
-                results += header
+                results_header = header
 
             if len(records_raw) == 0:
                 logger.info("empty page found")
@@ -115,8 +204,9 @@ class Client:
                     event_magnitudes,
                 ) = parser.unpack_records(records_raw)
                 records = record_filter(records_raw, event_ids)
-                has_next_page = self._check_filtered_results(records, records_raw)
-                has_next_page = self._check_valid_magnitude_results(query, event_magnitudes)
+                has_next_page = self._check_filtered_results(
+                    records, records_raw
+                ) and self._check_valid_magnitude_results(query, event_magnitudes)
                 logger.info("records")
                 results += records
 
@@ -126,10 +216,7 @@ class Client:
                 query = self._next_page(query, event_times[-1], event_magnitudes[-1], limit)
                 page_index += 1
 
-        logger.info("footer")
-        results += footer
-
-        return results
+        return results_header, results, footer
 
     @staticmethod
     def _check_filtered_results(records_filtered, records) -> bool:
@@ -192,27 +279,63 @@ class Client:
         }
         next_name, next_value = next_fields[query.orderby or "time"]
 
-        query_dict = query.dict()
-        query_dict[next_name] = next_value
-        query_dict["limit"] = limit
-
-        return Query(**query_dict)
+        return replace(query, **{next_name: next_value, "limit": limit})
 
     def _execute(self, query: Query) -> Response:  # Based on get_data
         self.history.append(query)
 
         out = None
-        with self.session as session:
+        params = query.dict()
+        cache_path = self._cache_path(params)
+        if cache_path is not None and (cached := self._read_cache(cache_path, query)) is not None:
+            logger.info(f"Using cached response ({cache_path})")
+            return cached
+
+        try:
             for attempts in range(MAX_ATTEMPTS):
-                download = session.get(
+                download = self.session.get(
                     BASE_URL,
-                    params={**query.dict()},
+                    params=params,
                 )
                 if download.status_code != RESPONSE_NOT_FOUND:
+                    if cache_path is not None and download.status_code == RESPONSE_OK:
+                        self._write_cache(cache_path, download.content)
                     return download
                 logger.warning(f"No connection could be made, retrying ({attempts}).")
-                sleep(2)
+                sleep(min(MAX_BACKOFF, BACKOFF_BASE * 2**attempts) + BACKOFF_BASE * random())
 
             logger.error("No connection could be made.")
+        finally:
+            if self._owns_session:
+                self.session.close()
 
         return out
+
+    def _cache_path(self, params: Dict[str, Any]) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        key = json.dumps(params, sort_keys=True).encode()
+        return self.cache_dir / f"{blake2b(key, digest_size=16).hexdigest()}.cache"
+
+    @staticmethod
+    def _read_cache(cache_path: Path, query: Query) -> Optional[Response]:
+        if not cache_path.exists():
+            return None
+
+        # Queries without an endtime run up to the present, so their results go stale
+        if query.endtime is None and time() - cache_path.stat().st_mtime > CACHE_TTL:
+            logger.info(f"Cached response expired ({cache_path})")
+            return None
+
+        download = Response()
+        download.status_code = RESPONSE_OK
+        download.encoding = "utf-8"
+        download._content = cache_path.read_bytes()  # pylint: disable=protected-access
+        return download
+
+    @staticmethod
+    def _write_cache(cache_path: Path, content: bytes):
+        makedirs(cache_path.parent, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_bytes(content)
+        replace_file(tmp_path, cache_path)
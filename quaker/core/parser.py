@@ -17,6 +17,18 @@ from quaker.globals import DEFAULT_FORMAT
 # TODO KmlParser
 # TODO XmlParser (same as QuakeML)
 
+GEOJSON_ID_RE = re.compile(r"\"id\":\"([^,]+)\"")
+GEOJSON_TIME_RE = re.compile(r"\"time\":([^,]+)")
+GEOJSON_MAG_RE = re.compile(r"\"mag\":([^,]+)")
+
+XML_ID_RE = re.compile(r"catalog:eventid=\"([^,]+)\"\s")
+XML_TIME_RE = re.compile(r"<time>.*<value>([^,]+)</value>.*</time>")
+XML_MAG_RE = re.compile(r"<mag>.*<value>([^,]+)</value>.*</mag>")
+
+KML_ID_RE = re.compile(r"id=\"([^,]+)\"")
+KML_TIME_RE = re.compile(r"<dt>Time</dt><dd>([\d-]+\s[\d:]+)\sUTC</dd>")
+KML_MAG_RE = re.compile(r"M\s([^,]+)\s-")
+
 
 class Parser:
     def __new__(cls, query: Query):
@@ -35,7 +47,8 @@ class Parser:
         return super().__new__(parser)
 
     def unpack_response(self, download: Response) -> Tuple[List[str], List[str], List[str]]:
-        lines = download.text.strip().split("\n")
+        # USGS serves UTF-8; decoding directly skips requests' charset detection on `.text`
+        lines = download.content.decode("utf-8").strip().split("\n")
         return (
             self.header(lines),
             self.records(lines),
@@ -102,9 +115,9 @@ class TextParser(Parser):
 
 class GeojsonParser(Parser):
     def event_record(self, line):
-        event_id = re.search(r"\"id\":\"([^,]+)\"", line)[1]
-        event_timestamp = re.search(r"\"time\":([^,]+)", line)[1]
-        event_magnitude = re.search(r"\"mag\":([^,]+)", line)[1]
+        event_id = GEOJSON_ID_RE.search(line)[1]
+        event_timestamp = GEOJSON_TIME_RE.search(line)[1]
+        event_magnitude = GEOJSON_MAG_RE.search(line)[1]
         return (
             event_id,
             datetime.utcfromtimestamp(float(event_timestamp) * 1e-3).isoformat(),
@@ -127,9 +140,9 @@ class GeojsonParser(Parser):
 
 class XmlParser(Parser):
     def event_record(self, line):
-        event_id = re.search(r"catalog:eventid=\"([^,]+)\"\s", line)[1]
-        event_time = re.search(r"<time>.*<value>([^,]+)</value>.*</time>", line)[1]
-        event_magnitude = re.search(r"<mag>.*<value>([^,]+)</value>.*</mag>", line)[1]
+        event_id = XML_ID_RE.search(line)[1]
+        event_time = XML_TIME_RE.search(line)[1]
+        event_magnitude = XML_MAG_RE.search(line)[1]
         return (
             event_id,
             event_time.removesuffix('Z'),
@@ -147,9 +160,9 @@ class XmlParser(Parser):
 
 class KmlParser(Parser):
     def event_record(self, line):
-        event_id = re.search(r"id=\"([^,]+)\"", line)[1]
-        event_time = re.search(r"<dt>Time</dt><dd>([\d-]+\s[\d:]+)\sUTC</dd>", line)[1]
-        event_magnitude = re.search(r"M\s([^,]+)\s-", line)[1]
+        event_id = KML_ID_RE.search(line)[1]
+        event_time = KML_TIME_RE.search(line)[1]
+        event_magnitude = KML_MAG_RE.search(line)[1]
         return (
             event_id,
             event_time.replace(' ', "T"),
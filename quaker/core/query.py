@@ -1,22 +1,58 @@
 """Classes and methods for representation of queries."""
 from abc import ABC, abstractproperty
 import re
-from dataclasses import dataclass, fields, asdict, Field
+from dataclasses import dataclass, fields, Field
 from datetime import datetime as dt
 from inspect import getdoc, getmro
-from typing import Optional, get_args, Any, List, Dict
+from typing import Optional, get_args, Any, List, Dict, Tuple
+
+
+# Allowed values for string fields, built once rather than on every `__post_init__`
+FORMAT_VALUES = frozenset(["csv", "geojson", "kml", "quakeml", "text", "xml"])
+ORDERBY_VALUES = frozenset(["time", "time-asc", "magnitude", "magnitude-asc"])
+INCLUDEDELETED_VALUES = frozenset(["true", "false", "only"])
+ALERTLEVEL_VALUES = frozenset(["green", "yellow", "orange", "red"])
+KMLCOLORBY_VALUES = frozenset(["age", "depth"])
+REVIEWSTATUS_VALUES = frozenset(["all", "automatic", "reviewed"])
+
+
+def is_valid_time(time_value: str) -> bool:
+    """Check if a string is a date or date-time accepted by `datetime.fromisoformat`."""
+    try:
+        dt.fromisoformat(time_value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+class LazyProperty(classmethod):
+    """Class property that is computed once per class and stored on that class.
+
+    Dataclass fields are fixed once the class is decorated, so metadata derived from them doesn't
+    need to be recomputed on every access (e.g. on each `__post_init__`). Pylint recognises this
+    name as a lazy property, so accesses are inferred as the computed value.
+    """
+
+    def __get__(self, obj, owner=None):
+        owner = type(obj) if owner is None else owner
+        cache_name = f"_cached_{self.__func__.__name__}"
+        if cache_name not in owner.__dict__:  # Subclasses shouldn't see their parent's cache
+            setattr(owner, cache_name, self.__func__(owner))
+        return owner.__dict__[cache_name]
 
 
 class _FieldHelper:
     """Mixin for generating metadata for a dataclass."""
 
-    @classmethod
-    @property
+    @LazyProperty
     def fields(cls) -> Dict[str, Field]:
         return {f.name: f for f in fields(cls)}
 
-    @classmethod
-    @property
+    @LazyProperty
+    def field_names(cls) -> Tuple[str, ...]:
+        return tuple(cls.fields)
+
+    @LazyProperty
     def field_docs(cls):
         _, doc = cls.__doc__.split("Args:", 1)
         doc = doc.strip().replace("\n" + " " * 12, " ")  # TODO replace this with regex
@@ -33,8 +69,7 @@ class _FieldHelper:
 
         return field_docs
 
-    @classmethod
-    @property
+    @LazyProperty
     def field_types(cls):
         field_types = {}
         for name, f in cls.fields.items():
@@ -78,7 +113,7 @@ class _FieldChecker:
     def assert_field_allowed_values(self, field_name, allowed_values):
         field_value = getattr(self, field_name)
         assert field_value is None or field_value in allowed_values, (
-            f"Invalid {field_name} ({field_value}), " f"must be one of {allowed_values}."
+            f"Invalid {field_name} ({field_value}), " f"must be one of {sorted(allowed_values)}."
         )
 
 
@@ -111,12 +146,12 @@ class _BaseQuery(_FieldHelper, _FieldChecker):
         return name.lower().removesuffix(" ()")
 
     def __str__(self):
-        out = self.__class__.__name__ + "("
-        for key, value in asdict(self).items():
-            if value is not None:
-                out += "\n" + 4 * " " + f"{key}: {str(value)}"
-        out += "\n)"
-        return out
+        lines = (
+            f"    {key}: {value}"
+            for key in self.field_names
+            if (value := getattr(self, key)) is not None
+        )
+        return "\n".join([self.__class__.__name__ + "(", *lines, ")"])
 
 
 @dataclass
@@ -141,11 +176,8 @@ class _QueryTime(_BaseQuery):
 
     def check_time_field_is_valid(self, field_name):
         time_value = getattr(self, field_name)
-        if time_value is not None:
-            try:
-                dt.fromisoformat(time_value)
-            except Exception as exc:
-                raise ValueError(f"Invalid time given (received {time_value})") from exc
+        if time_value is not None and not is_valid_time(time_value):
+            raise ValueError(f"Invalid time given (received {time_value})")
 
 
 @dataclass
@@ -245,10 +277,8 @@ class _QueryOther(_BaseQuery):
     def __post_init__(self):
         super().__post_init__()
         self.assert_fields_mutually_exclusive(["includedeleted", "includesuperceded"])
-        self.assert_field_allowed_values(
-            "orderby", ["time", "time-asc", "magnitude", "magnitude-asc"]
-        )
-        self.assert_field_allowed_values("includedeleted", ["true", "false", "only"])
+        self.assert_field_allowed_values("orderby", ORDERBY_VALUES)
+        self.assert_field_allowed_values("includedeleted", INCLUDEDELETED_VALUES)
         self.assert_fields_ordered("minmagnitude", "maxmagnitude")
         self.assert_fields_ordered("mindepth", "maxdepth")
         self.assert_fields_bounded(["minmagnitude", "maxmagnitude"], 0, 12)
@@ -305,9 +335,9 @@ class _QueryExtensions(_BaseQuery):
 
     def __post_init__(self):
         super().__post_init__()
-        self.assert_field_allowed_values("alertlevel", ["green", "yellow", "orange", "red"])
-        self.assert_field_allowed_values("kmlcolorby", ["age", "depth"])
-        self.assert_field_allowed_values("reviewstatus", ["all", "automatic", "reviewed"])
+        self.assert_field_allowed_values("alertlevel", ALERTLEVEL_VALUES)
+        self.assert_field_allowed_values("kmlcolorby", KMLCOLORBY_VALUES)
+        self.assert_field_allowed_values("reviewstatus", REVIEWSTATUS_VALUES)
 
         self.assert_fields_bounded(["mingap", "maxgap"], 0, 360)
         self.assert_fields_bounded(["mincdi", "maxcdi"], 0, 12)
@@ -330,10 +360,7 @@ class _QueryFormat(_BaseQuery):
 
     def __post_init__(self):
         super().__post_init__()
-        self.format = self.format
-        self.assert_field_allowed_values(
-            "format", ["csv", "text", "geojson", "xml", "quakeml", "xml"]
-        )
+        self.assert_field_allowed_values("format", FORMAT_VALUES)
 
 
 # TODO usage docs
@@ -357,11 +384,10 @@ class _CompositeFieldDocumenter(ABC):
                 "Args:",
             ]
         )
-        for class_name in cls.component_classes:
-            class_doc = getdoc(class_name)
-            _, args_doc = class_doc.split("Args:", 1)
-            doc = "\n".join([doc, args_doc])
-        return doc
+        args_docs = (
+            getdoc(class_name).split("Args:", 1)[1] for class_name in cls.component_classes
+        )
+        return "\n".join([doc, *args_docs])
 
     @classmethod
     @property
@@ -419,7 +445,7 @@ class Query(
         Args:
             include_nones: Whether to include keys that have `None` value.
         """
-        query_dict = asdict(self)
+        field_names = self.field_names
         if include_nones:
-            return query_dict
-        return {k: v for k, v in query_dict.items() if v is not None}
+            return {k: getattr(self, k) for k in field_names}
+        return {k: v for k in field_names if (v := getattr(self, k)) is not None}
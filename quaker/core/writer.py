@@ -56,7 +56,7 @@ class Writer:
         error_recived = None
         with open(self.output_file, "a", encoding="utf-8") as f:
             try:
-                f.writelines(f"{l}\n" for l in lines)
+                f.write("\n".join(lines) + "\n")
             except KeyboardInterrupt:
                 logger.error("Keyboard interrupt recieved, safely closing file.")
             except Exception as error:  # pylint: disable=broad-except
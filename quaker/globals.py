@@ -10,5 +10,8 @@ RESPONSE_NOT_FOUND = 404
 RESPONSE_OK = 200
 
 MAX_ATTEMPTS = 5
+BACKOFF_BASE = 0.25
+MAX_BACKOFF = 30
 MAX_PAGES = 42
+CACHE_TTL = 3600
 UPPER_LIMIT = 20000
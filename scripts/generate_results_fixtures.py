@@ -16,7 +16,5 @@ for fmt in ["csv", "geojson", "kml", "xml", "quakeml", "text"]:
         query = Query(format=fmt, starttime=starttime, endtime=endtime, limit=20)
         resp = client._execute(query)
 
-        lines = resp.text.split("\n")
         with open(f"scrap.page{page}.{fmt}", "w", encoding="utf-8") as f:
-            for line in lines:
-                f.writelines(line + "\n")
+            f.write(resp.text + "\n")
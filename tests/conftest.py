@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+
+import pytest
+from requests import Response
+from requests.sessions import Session
+
+from quaker.globals import BASE_URL, RESPONSE_OK
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# A stray `breakpoint()` shouldn't hang a test run (use `pytest --pdb` to debug instead)
+os.environ.setdefault("PYTHONBREAKPOINT", "0")
+
+
+@pytest.fixture(scope="session")
+def fixture_texts():
+    """Contents of each file in `tests/fixtures`, keyed by path relative to that directory."""
+    return {
+        str(fp.relative_to(FIXTURES_DIR)): fp.read_text(encoding="utf-8")
+        for fp in sorted(FIXTURES_DIR.glob("**/*"))
+        if fp.is_file()
+    }
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """A single `requests.Session` shared by every test (`requests_mock` patches its transport)."""
+    with Session() as session:
+        yield session
+
+
+@pytest.fixture
+def load_mock_requests(requests_mock, fixture_texts):
+    """Register a sequence of responses for `BASE_URL`.
+
+    Returns a function that takes a list of `(status_code, fixture_name)` pairs, where
+    `fixture_name` is a key of `fixture_texts` (or `None` for an empty body).
+    """
+
+    def _load_mock_requests(fixture_data):
+        assert isinstance(fixture_data, list)
+        assert len(fixture_data) > 0
+        assert len(fixture_data[0]) == 2
+        responses = [
+            dict(status_code=st) if fp is None else dict(status_code=st, text=fixture_texts[fp])
+            for st, fp in fixture_data
+        ]
+        requests_mock.get(BASE_URL, responses)
+        return requests_mock
+
+    return _load_mock_requests
+
+
+@pytest.fixture
+def fast_response(monkeypatch, fixture_texts):
+    """Answer every request with the same response, bypassing `requests_mock`.
+
+    Returns a function that takes a `fixture_name` (a key of `fixture_texts`) and an optional
+    `status_code`. Use `load_mock_requests` instead when a test needs a sequence of responses or
+    the request history.
+    """
+
+    def _fast_response(fixture_name, status_code=RESPONSE_OK):
+        response = Response()
+        response.status_code = status_code
+        response.encoding = "utf-8"
+        # pylint: disable-next=protected-access
+        response._content = fixture_texts[fixture_name].encode("utf-8")
+        monkeypatch.setattr(Session, "send", lambda self, request, **kwargs: response)
+        return response
+
+    return _fast_response
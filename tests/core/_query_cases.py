@@ -0,0 +1,182 @@
+"""Shared field values and parametrize cases for `Query` tests."""
+
+from types import MappingProxyType
+
+import pytest
+
+# Valid input for each `Query` field
+FIELD_VALUES = MappingProxyType(
+    {
+        # --- Format
+        "format": "csv",
+        # --- Time
+        "starttime": "2022-08-01",
+        "endtime": "2022-09-01",
+        "updatedafter": "2022-07-01",
+        # --- Location (rectangle)
+        "minlatitude": 60.0,
+        "minlongitude": 70.0,
+        "maxlatitude": 80.0,
+        "maxlongitude": 90.0,
+        # --- Location (circle)
+        "latitude": 60.0,
+        "longitude": 70.0,
+        "maxradius": 80.0,
+        "maxradiuskm": 85.0,
+        # --- Other
+        "catalog": "foo",
+        "contributor": "foo",
+        "eventid": "id1234",
+        "includeallmagnitudes": True,
+        "includeallorigins": True,
+        "includedeleted": "true",
+        "includesuperceded": True,
+        "limit": 300,
+        "maxdepth": 3.1,
+        "maxmagnitude": 7.0,
+        "mindepth": 2.9,
+        "minmagnitude": 6.0,
+        "offset": 600,
+        "orderby": "time",
+        # --- Extensions
+        "alertlevel": "yellow",
+        "callback": "foo",
+        "eventtype": "foo",
+        "jsonerror": True,
+        "kmlanimated": True,
+        "kmlcolorby": "age",
+        "maxcdi": 12.0,
+        "maxgap": 11.0,
+        "maxmmi": 10.0,
+        "maxsig": 2,
+        "mincdi": 11.0,
+        "minfelt": 10,
+        "mingap": 10.0,
+        "minsig": 1,
+        "producttype": "foo",
+        "productcode": "foo",
+        "reviewstatus": "all",
+    }
+)
+
+
+TIME_FIELDS = ("starttime", "endtime", "updatedafter")
+
+FIELD_GROUPS = (
+    pytest.param(("format",), id="format"),
+    pytest.param(TIME_FIELDS, id="time"),
+    pytest.param(
+        (
+            "minlatitude",
+            "minlongitude",
+            "maxlatitude",
+            "maxlongitude",
+        ),
+        id="rectangle",
+    ),
+    pytest.param(
+        (
+            "latitude",
+            "longitude",
+            "maxradius",
+        ),
+        id="circle-maxradius",
+    ),
+    pytest.param(
+        (
+            "latitude",
+            "longitude",
+            "maxradiuskm",
+        ),
+        id="circle-maxradiuskm",
+    ),
+    pytest.param(
+        (
+            "catalog",
+            "contributor",
+            "eventid",
+            "includeallmagnitudes",
+            "includeallorigins",
+            "includedeleted",
+            "limit",
+            "maxdepth",
+            "maxmagnitude",
+            "mindepth",
+            "minmagnitude",
+            "offset",
+            "orderby",
+        ),
+        id="other-includedeleted",
+    ),
+    pytest.param(
+        (
+            "catalog",
+            "contributor",
+            "eventid",
+            "includeallmagnitudes",
+            "includeallorigins",
+            "includesuperceded",
+            "limit",
+            "maxdepth",
+            "maxmagnitude",
+            "mindepth",
+            "minmagnitude",
+            "offset",
+            "orderby",
+        ),
+        id="other-includesuperceded",
+    ),
+    pytest.param(
+        (
+            "alertlevel",
+            "callback",
+            "eventtype",
+            "jsonerror",
+            "kmlanimated",
+            "kmlcolorby",
+            "maxcdi",
+            "maxgap",
+            "maxmmi",
+            "maxsig",
+            "mincdi",
+            "minfelt",
+            "mingap",
+            "minsig",
+            "producttype",
+            "productcode",
+            "reviewstatus",
+        ),
+        id="extensions",
+    ),
+)
+
+STRING_CASES = (
+    ("orderby", ("time", "time-asc", "magnitude", "magnitude-asc")),
+    ("format", ("csv", "geojson", "kml", "quakeml", "text", "xml")),
+    ("includedeleted", ("true", "false", "only")),
+    ("alertlevel", ("green", "yellow", "orange", "red")),
+    ("kmlcolorby", ("age", "depth")),
+    ("reviewstatus", ("all", "automatic", "reviewed")),
+)
+
+VALID_STRING_CASES = tuple(
+    pytest.param(attribute, value, id=f"{attribute}={value}")
+    for attribute, allowed_values in STRING_CASES
+    for value in allowed_values
+)
+
+OOB_CASES = tuple(
+    pytest.param({field_name: invalid_value}, id=f"{field_name}={invalid_value}")
+    for field_names, invalid_values in (
+        (("maxcdi", "mincdi"), (-1, 13)),
+        (("maxgap", "mingap"), (-1, 361)),
+        (("offset",), (0, -1)),
+        (("maxradius",), (-0.01, 181)),
+        (("maxradiuskm",), (-0.01, 20001.7)),
+        (("minlatitude", "maxlatitude", "latitude"), (-91, 91)),
+        (("minlongitude", "maxlongitude"), (-361, 361)),
+        (("longitude",), (-181, 181)),
+    )
+    for field_name in field_names
+    for invalid_value in invalid_values
+)
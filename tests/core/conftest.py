@@ -0,0 +1,12 @@
+from dataclasses import fields
+
+import pytest
+
+from quaker.core.query import Query
+
+
+@pytest.fixture(scope="session")
+def empty_query():
+    """An empty query and its fields, shared across tests that only read from it."""
+    query = Query()
+    return query, fields(query)
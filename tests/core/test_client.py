@@ -1,74 +1,205 @@
+from io import StringIO
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
 import pytest
 import pandas as pd
-from requests import Session
 
-from quaker.globals import BASE_URL, RESPONSE_OK
+from quaker.globals import BASE_URL, RESPONSE_NO_CONTENT, RESPONSE_NOT_FOUND, RESPONSE_OK
 from quaker.core.query import Query
 from quaker.core.client import Client
 
 
 class TestClient:
     @staticmethod
-    def assert_files_equal(filepath_1, filepath_2):
-        with (
-            open(filepath_1, "r", encoding="utf-8") as file1,
-            open(filepath_2, "r", encoding="utf-8") as file2,
-        ):
-            assert file1.read() == file2.read()
-
-    @staticmethod
-    def create_mock_request(status_code, fixture_path):
-        if fixture_path is None:
-            return dict(status_code=status_code)
-        with open(fixture_path, "r", encoding="utf-8") as f:
-            return dict(text=f.read(), status_code=status_code)
-
-    def load_mock_requests(self, requests_mock, fixture_data):
-        assert isinstance(fixture_data, list)
-        assert len(fixture_data) > 0
-        assert len(fixture_data[0]) == 2
-        requests = [self.create_mock_request(st, fp) for st, fp in fixture_data]
-        requests_mock.get(BASE_URL, requests)
-        return requests_mock
+    def assert_file_equals_text(filepath, expected_text):
+        assert Path(filepath).read_text(encoding="utf-8") == expected_text
 
     @pytest.mark.parametrize("multi_page", [False, True])
-    def test_execute_dataframe(self, requests_mock, mocker, multi_page):
+    def test_execute_dataframe(
+        self, load_mock_requests, http_session, mocker, fixture_texts, multi_page
+    ):
         mocker.patch('quaker.core.client.UPPER_LIMIT', 20)
         n_pages, expected_filename = (1, "single_page") if not multi_page else (3, "multi_page")
 
         fixture_data = [
-            (RESPONSE_OK, f"./tests/fixtures/results/page{k}.csv")
+            (RESPONSE_OK, f"results/page{k}.csv")
             for k in range(n_pages)
         ]
-        expected_file = f"./tests/fixtures/expected/{expected_filename}.csv"
-        self.load_mock_requests(requests_mock, fixture_data=fixture_data)
+        expected_file = f"expected/{expected_filename}.csv"
+        load_mock_requests(fixture_data)
 
-        client = Client()
+        client = Client(session=http_session)
         mock_query = Query()
 
         output = client.execute(mock_query)
-        expected = pd.read_csv(expected_file)
+        expected = pd.read_csv(StringIO(fixture_texts[expected_file]))
 
         assert output.equals(expected)
 
     @pytest.mark.parametrize("query_format", ["csv", "text", "geojson", "xml", "quakeml", "xml"])
     @pytest.mark.parametrize("multi_page", [False, True])
-    def test_exectute_output_file(self, mocker, requests_mock, tmp_path, query_format, multi_page):
+    def test_exectute_output_file(
+        self,
+        mocker,
+        load_mock_requests,
+        http_session,
+        tmp_path,
+        fixture_texts,
+        query_format,
+        multi_page,
+    ):
         mocker.patch('quaker.core.client.UPPER_LIMIT', 20)
 
         output_file = tmp_path / f"test_execute.{query_format}"
         n_pages, expected_filename = (1, "single_page") if not multi_page else (3, "multi_page")
 
         fixture_data = [
-            (RESPONSE_OK, f"./tests/fixtures/results/page{k}.{query_format}")
+            (RESPONSE_OK, f"results/page{k}.{query_format}")
             for k in range(n_pages)
         ]
-        expected_file = f"./tests/fixtures/expected/{expected_filename}.{query_format}"
-        self.load_mock_requests(requests_mock, fixture_data=fixture_data)
+        expected_file = f"expected/{expected_filename}.{query_format}"
+        load_mock_requests(fixture_data)
 
-        client = Client()
+        client = Client(session=http_session)
         mock_query = Query(format=query_format)
 
         client.execute(mock_query, output_file=output_file)
 
-        self.assert_files_equal(output_file, expected_file)
+        self.assert_file_equals_text(output_file, fixture_texts[expected_file])
+
+    def test_execute_stops_after_short_page(self, mocker, requests_mock, fixture_texts):
+        mocker.patch("quaker.core.client.UPPER_LIMIT", 20)
+        header, *rows = fixture_texts["results/page2.csv"].strip().split("\n")
+        pages = [
+            fixture_texts["results/page0.csv"],
+            fixture_texts["results/page1.csv"],
+            "\n".join([header, *rows[:5]]),
+        ]
+        requests_mock.get(BASE_URL, [dict(status_code=RESPONSE_OK, text=page) for page in pages])
+
+        client = Client()
+        client.execute(Query(format="csv"))
+
+        assert requests_mock.call_count == len(pages)
+
+    def test_execute_retry_backoff(self, mocker, load_mock_requests, http_session):
+        mock_sleep = mocker.patch("quaker.core.client.sleep")
+        mocker.patch("quaker.core.client.random", return_value=0.0)
+        fixture_data = [
+            (RESPONSE_NOT_FOUND, None),
+            (RESPONSE_NOT_FOUND, None),
+            (RESPONSE_OK, "results/page0.csv"),
+        ]
+        load_mock_requests(fixture_data)
+
+        client = Client(session=http_session)
+        download = client._execute(Query(format="csv"))  # pylint: disable=protected-access
+
+        assert download.status_code == RESPONSE_OK
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert delays == [0.25, 0.5]
+
+    @pytest.mark.parametrize("orderby", [None, "time-asc"])
+    def test_split_query(self, orderby):
+        query = Query(starttime="2022-08-01", endtime="2022-08-04", orderby=orderby)
+
+        sub_queries = Client._split_query(query, 3)  # pylint: disable=protected-access
+
+        expected = [
+            ("2022-08-01T00:00:00", "2022-08-02T00:00:00"),
+            ("2022-08-02T00:00:00", "2022-08-03T00:00:00"),
+            ("2022-08-03T00:00:00", "2022-08-04T00:00:00"),
+        ]
+        if orderby is None:
+            expected.reverse()
+        assert [(q.starttime, q.endtime) for q in sub_queries] == expected
+
+    @pytest.mark.parametrize(
+        "query_input",
+        [
+            dict(starttime="2022-08-01"),
+            dict(endtime="2022-08-04"),
+            dict(starttime="2022-08-01", endtime="2022-08-04", limit=10),
+            dict(starttime="2022-08-01", endtime="2022-08-04", orderby="magnitude"),
+            dict(starttime="2022-08-04", endtime="2022-08-01"),
+        ],
+    )
+    def test_split_query_unsplittable(self, query_input):
+        query = Query(**query_input)
+        assert Client._split_query(query, 3) is None  # pylint: disable=protected-access
+
+    @pytest.mark.parametrize(
+        "interval_rows",
+        [
+            pytest.param(
+                {
+                    "2022-08-03": slice(0, 8),
+                    "2022-08-02": slice(7, 14),
+                    "2022-08-01": slice(13, 20),
+                },
+                id="all-intervals",
+            ),
+            pytest.param(
+                {"2022-08-03": None, "2022-08-02": slice(0, 10), "2022-08-01": slice(9, 20)},
+                id="latest-interval-empty",
+            ),
+        ],
+    )
+    def test_execute_parallel(self, mocker, requests_mock, tmp_path, fixture_texts, interval_rows):
+        mocker.patch("quaker.core.client.UPPER_LIMIT", 20)
+        output_file = tmp_path / "test_execute_parallel.csv"
+        header, *rows = fixture_texts["results/page0.csv"].strip().split("\n")
+        # Each interval gets its own short page, and neighbouring pages share a boundary event
+        for starttime, row_slice in interval_rows.items():
+            response = (
+                dict(status_code=RESPONSE_NO_CONTENT)
+                if row_slice is None
+                else dict(status_code=RESPONSE_OK, text="\n".join([header, *rows[row_slice]]))
+            )
+            requests_mock.get(f"{BASE_URL}?starttime={starttime}T00:00:00", **response)
+
+        client = Client()
+        query = Query(format="csv", starttime="2022-08-01", endtime="2022-08-04")
+
+        client.execute(query, output_file=output_file, n_workers=3)
+
+        self.assert_file_equals_text(output_file, fixture_texts["expected/single_page.csv"])
+        assert sorted(q.starttime for q in client.history) == [
+            "2022-08-01T00:00:00",
+            "2022-08-02T00:00:00",
+            "2022-08-03T00:00:00",
+        ]
+
+    def test_execute_cached(self, load_mock_requests, http_session, tmp_path):
+        requests_mock = load_mock_requests([(RESPONSE_OK, "results/page0.csv")])
+        query = Query(format="csv", starttime="2022-08-01", endtime="2022-08-04")
+
+        client = Client(cache_dir=tmp_path / "cache", session=http_session)
+        download = client._execute(query)  # pylint: disable=protected-access
+        cached_download = client._execute(query)  # pylint: disable=protected-access
+
+        assert requests_mock.call_count == 1
+        assert cached_download.ok
+        assert cached_download.text == download.text
+
+    @pytest.mark.parametrize("shared_session", [False, True])
+    def test_execute_closes_own_session(self, mocker, fast_response, http_session, shared_session):
+        fast_response("results/page0.csv")
+        client = Client(session=http_session) if shared_session else Client()
+        mock_close = mocker.patch.object(client.session, "close")
+
+        client._execute(Query(format="csv"))  # pylint: disable=protected-access
+
+        assert mock_close.called is not shared_session
+
+    def test_execute_request_params(self, load_mock_requests, http_session):
+        requests_mock = load_mock_requests([(RESPONSE_OK, "results/page0.csv")])
+        query = Query(format="csv", starttime="2022-08-01", minmagnitude=4.5, limit=10)
+
+        client = Client(session=http_session)
+        client._execute(query)  # pylint: disable=protected-access
+
+        request_url = urlsplit(requests_mock.request_history[0].url)
+        assert request_url.path == urlsplit(BASE_URL).path
+        assert dict(parse_qsl(request_url.query)) == {k: str(v) for k, v in query.dict().items()}
@@ -1,26 +1,33 @@
-from abc import ABC
-from unittest.mock import patch
-from dataclasses import dataclass, fields, asdict, Field
-from datetime import datetime as dt
-from inspect import getdoc, getmro
-from itertools import product
-from typing import Optional, get_args
+from dataclasses import dataclass, asdict, Field
+from inspect import getdoc
+import sys
+from typing import Optional
 
 import pytest
 
 from quaker.core.query import (
     Query,
+    is_valid_time,
     _BaseQuery,
-    _FieldHelper,
-    _FieldChecker,
     _CompositeFieldDocumenter,
 )
 
+from ._query_cases import (
+    FIELD_GROUPS,
+    FIELD_VALUES,
+    OOB_CASES,
+    STRING_CASES,
+    TIME_FIELDS,
+    VALID_STRING_CASES,
+)
+
 
-def assert_query_type_and_value(query, field_name, value):
+def assert_query_type_and_value(query, field_name, value, field_types=None):
+    if field_types is None:
+        field_types = query.field_types
     field_value = getattr(query, field_name)
     assert field_value == value, f"{field_name = }, {value = }"
-    assert isinstance(field_value, query.field_types[field_name])
+    assert isinstance(field_value, field_types[field_name])
 
 
 MOCK_QUERY_FIELD_TYPE = int
@@ -87,6 +94,43 @@ class MockQuery(_CompositeFieldDocumenter, _QueryComponentMock):
         return doc
 
 
+# `datetime.fromisoformat` only accepts these forms from Python 3.11
+EXTENDED_ISO_TIMES = [
+    pytest.param(
+        time_value,
+        marks=pytest.mark.skipif(sys.version_info < (3, 11), reason="requires Python 3.11"),
+    )
+    for time_value in [
+        "2022-08-01T00:00:00Z",
+        "2022-08-01T00:00:00.123Z",
+        "20220801",
+        "2022-08-01T00:00:00+0000",
+        "2022-08-01T00:00:00-05",
+    ]
+]
+
+
+@pytest.mark.parametrize(
+    "time_value, expected",
+    [
+        ("2022-12-16", True),
+        ("2022-12-16T02:44:30", True),
+        ("2022-12-16 02:44:30.123", True),
+        ("2022-12-16T02:44:30+00:00", True),
+        ("2022-13-16", False),
+        ("2022-13-16T00:00:00", False),
+        ("2022-02-30T00:00:00", False),
+        ("2022-12-16T02:44:30junk", False),
+        ("2022-12-16Tab:cd:ef", False),
+        ("01-01-2020", False),
+        ("foo", False),
+        *[pytest.param(*param.values, True, marks=param.marks) for param in EXTENDED_ISO_TIMES],
+    ],
+)
+def test_is_valid_time(time_value, expected):
+    assert is_valid_time(time_value) is expected
+
+
 class TestAssertQueryTypeAndValue:
     value = 123
 
@@ -180,31 +224,44 @@ class TestAssertQueryTypeAndValue:
             query.assert_field_allowed_values("mock_field", [5])
 
 
+@pytest.fixture(scope="module")
+def empty_mock_query():
+    """An empty `_QueryComponentMock`, shared across tests that only read from it."""
+    return _QueryComponentMock()
+
+
 class TestBaseQuery:
     def test_docs(self):
         query = MockQuery()
         # pylint: disable=protected-access
         assert getdoc(query) == query._expected_doc
 
-    def test_name(self):
-        query = _QueryComponentMock()
+    def test_name(self, empty_mock_query):
+        query = empty_mock_query
         assert query.name == "component (mock)"
 
-    def test_post_init(self):
-        with patch("quaker.core.query._BaseQuery.__post_init__") as mock_post_init:
-            query = MockQuery()
-            mock_post_init.assert_called()
-            assert query._mock_query_post_init_called
+    def test_post_init(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(_BaseQuery, "__post_init__", lambda self: calls.append(self))
+        query = MockQuery()
+        assert calls == [query]
+        assert query._mock_query_post_init_called
 
-    def test_fields(self):
-        query = _QueryComponentMock()
+    def test_fields(self, empty_mock_query):
+        query = empty_mock_query
         query_fields = query.fields
-        assert list(query_fields.keys()) == ["mock_field", "another_mock_field"]
+        assert tuple(query_fields) == ("mock_field", "another_mock_field")
         for k in query_fields:
             assert isinstance(query_fields.get(k), Field)
 
-    def test_field_docs(self):
-        query = _QueryComponentMock()
+    def test_field_metadata_cached_per_class(self):
+        assert _QueryComponentMock.fields is _QueryComponentMock.fields
+        assert _QueryComponentMock.field_names == ("mock_field", "another_mock_field")
+        assert Query.fields is not _BaseQuery.fields
+        assert Query.field_names == tuple(Query.fields)
+
+    def test_field_docs(self, empty_mock_query):
+        query = empty_mock_query
         field_docs = query.field_docs
         expected_items = [
             ("mock_field", "A mock field."),
@@ -215,176 +272,56 @@ class TestBaseQuery:
             assert k1 == k2
             assert v1 == v2
 
-    def test_field_types(self):
-        query = _QueryComponentMock()
+    def test_field_types(self, empty_mock_query):
+        query = empty_mock_query
         field_types = query.field_types
-        assert list(field_types.keys()) == ["mock_field"]
+        assert tuple(field_types) == ("mock_field",)
         for k in field_types:
             assert field_types.get(k) == int
 
 
+@pytest.fixture(scope="class")
+def query_field_types():
+    return Query.field_types
+
+
 class TestQuery:
-    format = "csv"
-
-    starttime = "2022-08-01"
-    endtime = "2022-09-01"
-    updatedafter = "2022-07-01"
-
-    minlatitude = 60.0
-    minlongitude = 70.0
-    maxlatitude = 80.0
-    maxlongitude = 90.0
-
-    latitude = 60.0
-    longitude = 70.0
-    maxradius = 80.0
-    maxradiuskm = 85.0
-
-    catalog = "foo"
-    contributor = "foo"
-    eventid = "id1234"
-    includeallmagnitudes = True
-    includeallorigins = True
-    includedeleted = "true"
-    includesuperceded = True
-    limit = 300
-    maxdepth = 3.1
-    maxmagnitude = 7.0
-    mindepth = 2.9
-    minmagnitude = 6.0
-    offset = 600
-    orderby = "time"
-
-    alertlevel = "yellow"
-    callback = "foo"
-    eventtype = "foo"
-    jsonerror = True
-    kmlanimated = True
-    kmlcolorby = "age"
-    maxcdi = 12.0
-    maxgap = 11.0
-    maxmmi = 10.0
-    maxsig = 2
-    mincdi = 11.0
-    minfelt = 10
-    mingap = 10.0
-    minsig = 1
-    producttype = "foo"
-    productcode = "foo"
-    reviewstatus = "all"
-
-    def test_empty(self):
+    def test_empty(self, empty_query):
         """Empty queries should be valid, and have None for each field."""
-        query = Query()
-        for field in fields(query):
+        query, query_fields = empty_query
+        for field in query_fields:
             assert getattr(query, field.name) is None
 
     def test_asdict(self):
         query_input = dict(
-            starttime=self.starttime,
-            endtime=self.endtime,
-            updatedafter=self.updatedafter,
-            minlatitude=self.minlatitude,
-            minlongitude=self.minlongitude,
-            maxlatitude=self.maxlatitude,
-            maxlongitude=self.maxlongitude,
+            starttime=FIELD_VALUES["starttime"],
+            endtime=FIELD_VALUES["endtime"],
+            updatedafter=FIELD_VALUES["updatedafter"],
+            minlatitude=FIELD_VALUES["minlatitude"],
+            minlongitude=FIELD_VALUES["minlongitude"],
+            maxlatitude=FIELD_VALUES["maxlatitude"],
+            maxlongitude=FIELD_VALUES["maxlongitude"],
         )
         query = Query(**query_input)
-        assert {k: v for k, v in asdict(query).items() if v is not None} == query_input
+        assert query.dict() == query_input
 
-    @pytest.mark.parametrize(
-        "field_names",
-        [
-            # Format field
-            ["format"],
-            # Time fields
-            [
-                "starttime",
-                "endtime",
-                "updatedafter",
-            ],
-            # Location (rectangle) fields
-            [
-                "minlatitude",
-                "minlongitude",
-                "maxlatitude",
-                "maxlongitude",
-            ],
-            # Location (circle) fields, maxradius
-            [
-                "latitude",
-                "longitude",
-                "maxradius",
-            ],
-            # Location (circle) fields, maxradiuskm
-            [
-                "latitude",
-                "longitude",
-                "maxradiuskm",
-            ],
-            # Other fields, includedeleted
-            [
-                "catalog",
-                "contributor",
-                "eventid",
-                "includeallmagnitudes",
-                "includeallorigins",
-                "includedeleted",
-                "limit",
-                "maxdepth",
-                "maxmagnitude",
-                "mindepth",
-                "minmagnitude",
-                "offset",
-                "orderby",
-            ],
-            # Other fields, includesuperceded
-            [
-                "catalog",
-                "contributor",
-                "eventid",
-                "includeallmagnitudes",
-                "includeallorigins",
-                "includesuperceded",
-                "limit",
-                "maxdepth",
-                "maxmagnitude",
-                "mindepth",
-                "minmagnitude",
-                "offset",
-                "orderby",
-            ],
-            # Extension fields
-            [
-                "alertlevel",
-                "callback",
-                "eventtype",
-                "jsonerror",
-                "kmlanimated",
-                "kmlcolorby",
-                "maxcdi",
-                "maxgap",
-                "maxmmi",
-                "maxsig",
-                "mincdi",
-                "minfelt",
-                "mingap",
-                "minsig",
-                "producttype",
-                "productcode",
-                "reviewstatus",
-            ],
-        ],
-    )
-    def test_fields(self, field_names):
+    def test_dict(self):
+        query_input = {name: FIELD_VALUES[name] for name in ["starttime", "limit"]}
+        query = Query(**query_input)
+        assert query.dict() == query_input
+        assert query.dict(include_nones=True) == asdict(query)
+
+    @pytest.mark.parametrize("field_names", FIELD_GROUPS)
+    def test_fields(self, monkeypatch, query_field_types, field_names):
         """Ensure inputs are valid."""
-        query = Query(**{name: getattr(self, name) for name in field_names})
+        query = Query(**{name: FIELD_VALUES[name] for name in field_names})
         for name in field_names:
-            assert_query_type_and_value(query, name, getattr(self, name))
+            assert_query_type_and_value(query, name, FIELD_VALUES[name], query_field_types)
 
-        with patch("quaker.core.query._BaseQuery.__post_init__") as mock_post_init:
-            query = Query(**{name: getattr(self, name) for name in field_names})
-            mock_post_init.assert_called()
+        calls = []
+        monkeypatch.setattr(_BaseQuery, "__post_init__", lambda self: calls.append(self))
+        query = Query(**{name: FIELD_VALUES[name] for name in field_names})
+        assert calls == [query]
 
     @pytest.mark.parametrize(
         "valid_time",
@@ -392,70 +329,62 @@ class TestQuery:
             "2022-12-16",
             "2022-12-16T02:44:30",
             "2022-12-16T02:44:30+00:00",
+            *EXTENDED_ISO_TIMES,
         ],
     )
-    def test_valid_times(self, valid_time):
+    @pytest.mark.parametrize("attribute", TIME_FIELDS)
+    def test_valid_times(self, valid_time, attribute):
         """Ensure time inputs are valid."""
-        for attribute in ["starttime", "endtime", "updatedafter"]:
-            query = Query(**{attribute: valid_time})
-            assert getattr(query, attribute) == valid_time
+        query = Query(**{attribute: valid_time})
+        assert getattr(query, attribute) == valid_time
 
-    @pytest.mark.parametrize(
-        "attribute, allowed_values",
-        [
-            ("orderby", ["time", "time-asc", "magnitude", "magnitude-asc"]),
-            ("format", ["csv", "geojson", "text"]),
-            ("includedeleted", ["true", "false", "only"]),
-            ("alertlevel", ["green", "yellow", "orange", "red"]),
-            ("kmlcolorby", ["age", "depth"]),
-            ("reviewstatus", ["all", "automatic", "reviewed"]),
-        ],
-    )
-    def test_valid_strings(self, attribute, allowed_values):
-        for value in allowed_values:
-            query = Query(**{attribute: value})
-            assert getattr(query, attribute) == value
+    @pytest.mark.parametrize("attribute, value", VALID_STRING_CASES)
+    def test_valid_strings(self, attribute, value):
+        query = Query(**{attribute: value})
+        assert getattr(query, attribute) == value
 
-        with pytest.raises(AssertionError):
+    @pytest.mark.parametrize("attribute", [attribute for attribute, _ in STRING_CASES])
+    def test_invalid_string_value(self, attribute):
+        with pytest.raises(AssertionError, match=rf"Invalid {attribute} \(foo\)"):
             _ = Query(**{attribute: "foo"})
 
-    @pytest.mark.parametrize("invalid_time", ["foo", "01-01-2020"])
-    def test_raise_invalid_times(self, invalid_time):
-        """ValueError should be raised if a bad time input is given."""
-        for attribute in ["starttime", "endtime", "updatedafter"]:
-            with pytest.raises(ValueError):
-                _ = Query(**{attribute: invalid_time})
-
     @pytest.mark.parametrize(
-        "field_names, invalid_values",
+        "invalid_time",
         [
-            (["maxcdi", "mincdi"], [-1, 13]),
-            (["maxgap", "mingap"], [-1, 361]),
-            (["offset"], [0, -1]),
-            (["maxradius"], [-0.01, 181]),
-            (["maxradiuskm"], [-0.01, 20001.7]),
-            (["minlatitude", "minlatitude", "latitude"], [-91, 91]),
-            (["minlongitude", "maxlongitude"], [-361, 361]),
-            (["longitude"], [-181, 181]),
+            "foo",
+            "01-01-2020",
+            "2022-99-99T99:99:99",
+            "2022-02-30T00:00:00",
+            "2022-01-01Tab:cd:ef",
+            "2022-01-01T00:00:00garbage",
         ],
     )
-    def test_raise_out_of_bounds(self, field_names, invalid_values):
+    @pytest.mark.parametrize("attribute", TIME_FIELDS)
+    def test_raise_invalid_times(self, invalid_time, attribute):
         """ValueError should be raised if a bad time input is given."""
-        for attribute, invalid_value in product(field_names, invalid_values):
-            with pytest.raises(AssertionError):
-                _ = Query(**{attribute: invalid_value})
+        with pytest.raises(ValueError, match=r"Invalid time given"):
+            _ = Query(**{attribute: invalid_time})
+
+    @pytest.mark.parametrize("query_input", OOB_CASES)
+    def test_raise_out_of_bounds(self, query_input):
+        """AssertionError should be raised if a value is out of bounds."""
+        with pytest.raises(AssertionError):
+            _ = Query(**query_input)
 
     def test_raise_query_both_radius_fields(self):
         """ValueError shoud be raised if attempting to pass in maxradius and maxradiuskm."""
         with pytest.raises(AssertionError):
             _ = Query(maxradius=10, maxradiuskm=20)
 
-    def test_raise_query_invalid_latitudes_longitudes(self):
-        for attr1, attr2 in [
+    @pytest.mark.parametrize(
+        "attr1, attr2",
+        [
             ("minlatitude", "maxlatitude"),
             ("minlongitude", "maxlongitude"),
             ("minmagnitude", "maxmagnitude"),
             ("mindepth", "maxdepth"),
-        ]:
-            with pytest.raises(AssertionError):
-                _ = Query(**{attr1: 6, attr2: 5})
+        ],
+    )
+    def test_raise_query_invalid_latitudes_longitudes(self, attr1, attr2):
+        with pytest.raises(AssertionError, match=rf"{attr1} \(6.0\) is larger than {attr2}"):
+            _ = Query(**{attr1: 6, attr2: 5})
@@ -2,7 +2,7 @@ from collections import deque
 
 from pytest import fixture
 
-from quaker.core.record_filter import Cache, RecordFilter
+from quaker.core.record_filter import Cache
 
 
 class TestCache: